@@ -0,0 +1,11 @@
+# Gunicorn configuration for production: gunicorn tts:app
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 8000)}"
+
+# Synthesis is network-bound, so cooperative gevent workers let each process
+# keep many Google Cloud requests in flight at once
+worker_class = "gevent"
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+worker_connections = 1000
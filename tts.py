@@ -1,83 +1,579 @@
-from flask import Flask, request, jsonify, send_file
+from flask import Flask, Response, request, send_file, stream_with_context
 from flask_cors import CORS
+from flask_compress import Compress
+from werkzeug.exceptions import RequestEntityTooLarge
 import os
 import io
 import logging
+from google.api_core import exceptions as gexc
 from google.cloud import texttospeech
+from google.cloud.texttospeech_v1.services.text_to_speech.transports import TextToSpeechGrpcTransport
 from google.oauth2 import service_account
 import tempfile
-import json
+import orjson
+import hashlib
+import functools
+import itertools
+import time
+import threading
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError, wait
+
+# gRPC must be told to cooperate with gevent before any channel is created
+try:
+    from gevent import monkey
+    if monkey.is_module_patched('socket'):
+        from grpc.experimental import gevent as grpc_gevent
+        grpc_gevent.init_gevent()
+except ImportError:
+    pass
 
 PORT=8000
+DEBUG = os.environ.get("FLASK_DEBUG") == "1"
+
+# Under the debug reloader the parent process only watches files and never
+# serves requests, so Google clients are only created in the reloader child
+IS_RELOADER_PARENT = __name__ == '__main__' and DEBUG and os.environ.get("WERKZEUG_RUN_MAIN") != "true"
+
+# Number of TTS clients (each with its own gRPC channel) to spread requests over
+TTS_CLIENT_POOL_SIZE = int(os.environ.get("TTS_CLIENT_POOL_SIZE", 4))
+TTS_API_ENDPOINT = "texttospeech.googleapis.com:443"
+
+# Per-call deadline, and how long to wait before hedging a slow call on another channel
+TTS_REQUEST_TIMEOUT = float(os.environ.get("TTS_REQUEST_TIMEOUT", 10.0))
+TTS_HEDGE_DELAY = float(os.environ.get("TTS_HEDGE_DELAY", 0.5))
+TTS_STREAM_TIMEOUT = float(os.environ.get("TTS_STREAM_TIMEOUT", 30.0))  # Deadline for a whole /tts/stream response
+
+# Cap on concurrent syntheses per process; requests waiting longer than
+# TTS_BUSY_TIMEOUT for a slot are shed with a 503
+TTS_MAX_CONCURRENCY = int(os.environ.get("TTS_MAX_CONCURRENCY", 64))
+TTS_BUSY_TIMEOUT = 2.0
+
+# Request limits; the payload cap leaves room for 5000 escaped non-ASCII characters
+MAX_TTS_TEXT_LENGTH = 5000
+MAX_TTS_PAYLOAD_BYTES = 64 * 1024
+
+# Synthesized audio cache (in-memory LRU backed by an on-disk tier)
+TTS_CACHE_DIR = os.path.abspath(os.environ.get("TTS_CACHE_DIR", os.path.join(tempfile.gettempdir(), "tts-cache")))
+TTS_MEMORY_CACHE_BYTES = int(os.environ.get("TTS_MEMORY_CACHE_BYTES", 64 * 1024 * 1024))  # Per worker
+TTS_DISK_CACHE_BYTES = int(os.environ.get("TTS_DISK_CACHE_BYTES", 512 * 1024 * 1024))
+TTS_CACHE_MAX_AGE = 86400  # Seconds browsers/CDNs may reuse a cached response
+VOICES_CACHE_TTL = 3600  # Seconds before the /voices listing is fetched again
+
+# Defaults when the request omits languageCode / voiceName
+DEFAULT_LANGUAGE_CODE = "en-US"
+DEFAULT_VOICE = "en-US-Wavenet-D"
+
+# Streaming synthesis is only offered for Chirp 3 HD voices
+DEFAULT_STREAMING_VOICE = "en-US-Chirp3-HD-Charon"
 
 app = Flask(__name__)
 CORS(app)  # Enable CORS for all routes
 
+# Enforced by Werkzeug on the body stream itself, so chunked uploads are limited too
+app.config['MAX_CONTENT_LENGTH'] = MAX_TTS_PAYLOAD_BYTES
+
+# Compress JSON/text responses only; audio is already compressed
+app.config['COMPRESS_MIMETYPES'] = ['application/json', 'text/html', 'text/plain']
+app.config['COMPRESS_LEVEL'] = 5
+app.config['COMPRESS_MIN_SIZE'] = 512
+Compress(app)
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Initialize Google Cloud Text-to-Speech client using environment variables
-def create_tts_client():
+# Service account fields and the environment variables that provide them
+CREDENTIALS_ENV_MAP = {
+    "project_id": "GOOGLE_CLOUD_PROJECT_ID",
+    "private_key_id": "GOOGLE_CLOUD_PRIVATE_KEY_ID",
+    "private_key": "GOOGLE_CLOUD_PRIVATE_KEY",
+    "client_email": "GOOGLE_CLOUD_CLIENT_EMAIL",
+    "client_id": "GOOGLE_CLIENT_ID",
+    "auth_uri": "GOOGLE_AUTH_URI",
+    "token_uri": "GOOGLE_TOKEN_URI",
+    "auth_provider_x509_cert_url": "GOOGLE_AUTH_PROVIDER_x509_CERT_URL",
+    "client_x509_cert_url": "GOOGLE_CLIENT_x509_CERT_URL",
+    "universe_domain": "GOOGLE_UNIVERSE_DOMAIN"
+}
+
+REQUIRED_ENV_VARS = (
+    "GOOGLE_CLOUD_PROJECT_ID",
+    "GOOGLE_CLOUD_PRIVATE_KEY",
+    "GOOGLE_CLOUD_CLIENT_EMAIL"
+)
+
+# Build Google Cloud credentials from environment variables
+def load_credentials():
     try:
-        # Create credentials from environment variables
-        credentials_info = {
-            "type": "service_account",
-            "project_id": os.getenv("GOOGLE_CLOUD_PROJECT_ID"),
-            "private_key_id": os.getenv("GOOGLE_CLOUD_PRIVATE_KEY_ID"),
-            "private_key": (os.getenv("GOOGLE_CLOUD_PRIVATE_KEY") or "").replace('\\n', '\n'),
-            "client_email": os.getenv("GOOGLE_CLOUD_CLIENT_EMAIL"),
-            "client_id": os.getenv("GOOGLE_CLIENT_ID"),
-            "auth_uri": os.getenv("GOOGLE_AUTH_URI"),
-            "token_uri": os.getenv("GOOGLE_TOKEN_URI"),
-            "auth_provider_x509_cert_url": os.getenv("GOOGLE_AUTH_PROVIDER_x509_CERT_URL"),
-            "client_x509_cert_url": os.getenv("GOOGLE_CLIENT_x509_CERT_URL"),
-            "universe_domain": os.getenv("GOOGLE_UNIVERSE_DOMAIN")
-        }
+        # Read the environment once for every field
+        credentials_info = {"type": "service_account"}
+        for field, var in CREDENTIALS_ENV_MAP.items():
+            credentials_info[field] = os.environ.get(var)
+        credentials_info["private_key"] = (credentials_info["private_key"] or "").replace('\\n', '\n')
         
-        # Validate required environment variables
-        required_vars = [
-            "GOOGLE_CLOUD_PROJECT_ID",
-            "GOOGLE_CLOUD_PRIVATE_KEY",
-            "GOOGLE_CLOUD_CLIENT_EMAIL"
+        # Validate required environment variables against the same snapshot
+        missing_vars = [
+            var for field, var in CREDENTIALS_ENV_MAP.items()
+            if var in REQUIRED_ENV_VARS and not credentials_info[field]
         ]
-        
-        missing_vars = [var for var in required_vars if not os.getenv(var)]
         if missing_vars:
             logger.error(f"Missing required environment variables: {missing_vars}")
             return None
         
         # Create credentials object
-        credentials = service_account.Credentials.from_service_account_info(credentials_info)
+        return service_account.Credentials.from_service_account_info(credentials_info)
+        
+    except Exception as e:
+        logger.error(f"Failed to load Google Cloud credentials: {e}")
+        return None
+
+_credentials = None if IS_RELOADER_PARENT else load_credentials()
+
+# Initialize Google Cloud Text-to-Speech client from the shared credentials
+def create_tts_client(channel_id=0):
+    if _credentials is None:
+        return None
+    
+    try:
+        # Give every client its own channel and subchannel pool so gRPC doesn't
+        # collapse them onto a single shared HTTP/2 connection
+        channel = TextToSpeechGrpcTransport.create_channel(
+            TTS_API_ENDPOINT,
+            credentials=_credentials,
+            options=[
+                ("grpc.channel_id", channel_id),
+                ("grpc.use_local_subchannel_pool", 1)
+            ]
+        )
         
         # Create TTS client with credentials
-        client = texttospeech.TextToSpeechClient(credentials=credentials)
-        logger.info("Google Cloud Text-to-Speech client initialized successfully from environment variables")
+        client = texttospeech.TextToSpeechClient(transport=TextToSpeechGrpcTransport(channel=channel))
+        logger.info(f"Google Cloud Text-to-Speech client {channel_id} initialized successfully from environment variables")
         return client
         
     except Exception as e:
         logger.error(f"Failed to initialize Google Cloud TTS client: {e}")
         return None
 
-# Initialize the client
-client = create_tts_client()
+def create_client_pool(size):
+    """Create up to `size` TTS clients, stopping at the first failure"""
+    pool = []
+    for channel_id in range(size):
+        pool_client = create_tts_client(channel_id)
+        if pool_client is None:
+            break
+        pool.append(pool_client)
+    return pool
+
+# Initialize the client pool
+_client_pool = [] if IS_RELOADER_PARENT else create_client_pool(TTS_CLIENT_POOL_SIZE)
+client = _client_pool[0] if _client_pool else None
+_client_counter = itertools.count()
+
+def _pick_client_index():
+    """Round-robin over the client pool"""
+    return next(_client_counter) % len(_client_pool)
+
+def _pick_client():
+    return _client_pool[_pick_client_index()]
+
+def jresponse(payload, status=200):
+    """Build a JSON response using orjson"""
+    return Response(orjson.dumps(payload), status=status, mimetype='application/json')
+
+# Background executor for disk cache writes so responses don't wait on I/O
+_cache_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='tts-cache')
+
+def tts_cache_key(text, language_code, voice_name, speaking_rate, pitch, volume_gain_db):
+    """Build a stable key for a synthesis request"""
+    payload = orjson.dumps([text, language_code, voice_name, speaking_rate, pitch, volume_gain_db])
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+def _cache_path(key):
+    return os.path.join(TTS_CACHE_DIR, f"{key}.mp3")
+
+# In-memory LRU of MP3 bytes, bounded by total size rather than entry count
+_memory_cache = OrderedDict()
+_memory_cache_bytes = 0
+_memory_cache_lock = threading.Lock()
+
+def _memory_cache_get(key):
+    with _memory_cache_lock:
+        audio_content = _memory_cache.get(key)
+        if audio_content is not None:
+            _memory_cache.move_to_end(key)
+        return audio_content
+
+def _memory_cache_put(key, audio_content):
+    global _memory_cache_bytes
+    if len(audio_content) > TTS_MEMORY_CACHE_BYTES:
+        return
+    with _memory_cache_lock:
+        previous = _memory_cache.pop(key, None)
+        if previous is not None:
+            _memory_cache_bytes -= len(previous)
+        _memory_cache[key] = audio_content
+        _memory_cache_bytes += len(audio_content)
+        while _memory_cache_bytes > TTS_MEMORY_CACHE_BYTES:
+            _, evicted = _memory_cache.popitem(last=False)
+            _memory_cache_bytes -= len(evicted)
+
+def _read_cache(key):
+    path = _cache_path(key)
+    try:
+        with open(path, 'rb') as f:
+            audio_content = f.read()
+            mtime_ns = os.fstat(f.fileno()).st_mtime_ns
+        # Refresh the atime so pruning evicts the least recently used entries first.
+        # The mtime is kept as written since it is served as Last-Modified
+        os.utime(path, ns=(time.time_ns(), mtime_ns))
+        return audio_content
+    except OSError:
+        return None
+
+# Estimated size of the disk tier; re-measured whenever it is pruned
+_disk_cache_bytes = None
+_disk_cache_writes = 0
+DISK_CACHE_RESCAN_WRITES = 64  # Re-measure periodically to account for other workers' writes
+STALE_TMP_AGE = 3600  # Seconds before an orphaned temp file is removed
+
+def _prune_disk_cache():
+    """Delete the least recently used cache files until the disk tier is back under 90% of TTS_DISK_CACHE_BYTES"""
+    global _disk_cache_bytes
+    entries = []
+    total = 0
+    now = time.time()
+    with os.scandir(TTS_CACHE_DIR) as it:
+        for entry in it:
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            if entry.name.endswith('.mp3'):
+                entries.append((stat.st_atime, stat.st_size, entry.path))
+                total += stat.st_size
+            elif entry.name.endswith('.tmp') and now - stat.st_mtime > STALE_TMP_AGE:
+                try:
+                    os.remove(entry.path)
+                except OSError:
+                    pass
+    
+    if total > TTS_DISK_CACHE_BYTES:
+        entries.sort()
+        target = TTS_DISK_CACHE_BYTES * 0.9
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+        logger.info(f"Pruned TTS disk cache to {total} bytes")
+    _disk_cache_bytes = total
+
+def _write_cache(key, audio_content):
+    global _disk_cache_bytes, _disk_cache_writes
+    try:
+        os.makedirs(TTS_CACHE_DIR, exist_ok=True)
+        # Write to a unique temporary file first so readers never see a partial MP3
+        fd, tmp_path = tempfile.mkstemp(dir=TTS_CACHE_DIR, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(audio_content)
+            os.replace(tmp_path, _cache_path(key))
+        except OSError:
+            os.remove(tmp_path)
+            raise
+        
+        # Only the single cache writer thread touches these counters
+        _disk_cache_writes += 1
+        if _disk_cache_bytes is not None:
+            _disk_cache_bytes += len(audio_content)
+        if (_disk_cache_bytes is None or _disk_cache_bytes > TTS_DISK_CACHE_BYTES
+                or _disk_cache_writes % DISK_CACHE_RESCAN_WRITES == 0):
+            _prune_disk_cache()
+    except OSError as e:
+        logger.warning(f"Failed to write TTS cache entry {key}: {e}")
+
+@functools.lru_cache(maxsize=256)
+def _voice_params(language_code, voice_name):
+    return texttospeech.VoiceSelectionParams(
+        language_code=language_code,
+        name=voice_name
+    )
+
+@functools.lru_cache(maxsize=16)
+def _audio_config(speaking_rate, pitch, volume_gain_db):
+    return texttospeech.AudioConfig(
+        audio_encoding=texttospeech.AudioEncoding.MP3,
+        speaking_rate=speaking_rate,
+        pitch=pitch,
+        volume_gain_db=volume_gain_db
+    )
+
+_STREAMING_AUDIO_CONFIG = texttospeech.StreamingAudioConfig(
+    audio_encoding=texttospeech.AudioEncoding.OGG_OPUS
+)
+
+# Runs synthesis attempts so a slow one can be raced against a hedge. Every
+# submitted attempt holds a slot, so there is always a free worker for it
+_hedge_executor = ThreadPoolExecutor(max_workers=TTS_MAX_CONCURRENCY, thread_name_prefix='tts-hedge')
+
+class TTSBusyError(Exception):
+    """Raised when no synthesis slot frees up within TTS_BUSY_TIMEOUT"""
+
+# One slot per outbound synthesis RPC (including hedges and streams)
+_tts_semaphore = threading.BoundedSemaphore(TTS_MAX_CONCURRENCY)
+_busy_rejections = 0
+_busy_rejections_lock = threading.Lock()
+
+def acquire_tts_slot():
+    """Take a synthesis slot, shedding load rather than queueing behind a saturated backend"""
+    global _busy_rejections
+    if _tts_semaphore.acquire(timeout=TTS_BUSY_TIMEOUT):
+        return
+    with _busy_rejections_lock:
+        _busy_rejections += 1
+        rejections = _busy_rejections
+    logger.warning(f"TTS concurrency limit reached ({TTS_MAX_CONCURRENCY}), rejected {rejections} requests so far")
+    raise TTSBusyError()
+
+# Failures where a second attempt on another channel may still succeed
+HEDGEABLE_ERRORS = (gexc.ServiceUnavailable, gexc.DeadlineExceeded)
+
+def synthesize_hedged(synthesis_input, voice, audio_config):
+    """Call synthesize_speech, sending a second attempt on the next channel if the first is slow or unavailable"""
+    def attempt(index):
+        # The caller took a slot for this attempt; it is held until the RPC finishes,
+        # even if another attempt already won
+        try:
+            return _client_pool[index].synthesize_speech(
+                input=synthesis_input,
+                voice=voice,
+                audio_config=audio_config,
+                timeout=TTS_REQUEST_TIMEOUT
+            )
+        finally:
+            _tts_semaphore.release()
+    
+    index = _pick_client_index()
+    acquire_tts_slot()
+    
+    # A hedge on the same channel would share the stuck connection, so don't bother
+    if len(_client_pool) < 2:
+        return attempt(index)
+    
+    try:
+        primary = _hedge_executor.submit(attempt, index)
+    except BaseException:
+        _tts_semaphore.release()
+        raise
+    try:
+        return primary.result(timeout=TTS_HEDGE_DELAY)
+    except FutureTimeoutError:
+        logger.info(f"TTS request exceeded {TTS_HEDGE_DELAY}s, sending hedged attempt")
+    except HEDGEABLE_ERRORS as e:
+        logger.info(f"TTS request failed with {e.code}, sending hedged attempt")
+    
+    # Under load there may be no slot to spare; then just wait on the primary
+    if not _tts_semaphore.acquire(blocking=False):
+        logger.info("No free TTS slot, skipping hedged attempt")
+        return primary.result()
+    try:
+        hedge = _hedge_executor.submit(attempt, (index + 1) % len(_client_pool))
+    except BaseException:
+        _tts_semaphore.release()
+        raise
+    pending = {primary, hedge}
+    error = None
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None:
+                return future.result()
+            error = error or future.exception()
+    raise error
+
+def _synthesize_cached(key, text, language_code, voice_name, speaking_rate, pitch, volume_gain_db):
+    """Return MP3 bytes for the request, checking the memory and disk caches before calling Google"""
+    audio_content = _memory_cache_get(key)
+    if audio_content is not None:
+        return audio_content
+    
+    audio_content = _read_cache(key)
+    if audio_content is not None:
+        logger.info(f"TTS disk cache hit: {key}")
+        _memory_cache_put(key, audio_content)
+        return audio_content
+
+    # Only the input changes per call; voice and audio protos are reused
+    synthesis_input = texttospeech.SynthesisInput(text=text)
+    
+    # Make the TTS request
+    response = synthesize_hedged(
+        synthesis_input,
+        _voice_params(language_code, voice_name),
+        _audio_config(speaking_rate, pitch, volume_gain_db)
+    )
+    
+    _memory_cache_put(key, response.audio_content)
+    _cache_writer.submit(_write_cache, key, response.audio_content)
+    return response.audio_content
+
+# In-flight syntheses by cache key, so concurrent identical requests share one RPC
+COALESCE_WAIT_MARGIN = 1.0
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+def synthesize_coalesced(key, text, language_code, voice_name, speaking_rate, pitch, volume_gain_db):
+    """Return MP3 bytes, waiting on an identical in-flight synthesis instead of starting another"""
+    with _inflight_lock:
+        future = _inflight.get(key)
+        is_leader = future is None
+        if is_leader:
+            future = _inflight[key] = Future()
+    
+    if is_leader:
+        try:
+            future.set_result(_synthesize_cached(
+                key, text, language_code, voice_name, speaking_rate, pitch, volume_gain_db
+            ))
+        except Exception as e:
+            future.set_exception(e)
+        except BaseException:
+            # e.g. gevent.Timeout or GreenletExit: release followers, then let it propagate
+            future.set_exception(RuntimeError('Synthesis was aborted'))
+            raise
+        finally:
+            with _inflight_lock:
+                _inflight.pop(key, None)
+    
+    # Followers never wait longer than the leader could take (slot wait, hedge delay, deadline),
+    # plus a margin for the cache reads and writes around its RPC
+    return future.result(timeout=TTS_BUSY_TIMEOUT + TTS_HEDGE_DELAY + TTS_REQUEST_TIMEOUT + COALESCE_WAIT_MARGIN)
+
+def parse_tts_request(default_voice_name):
+    """Extract and validate TTS fields from the JSON body (or query string for GET/HEAD), returning an error response if invalid"""
+    if request.method in ('GET', 'HEAD'):
+        data = request.args
+    else:
+        # Reject oversized bodies before spending any time parsing them
+        content_length = request.content_length
+        if content_length and content_length > MAX_TTS_PAYLOAD_BYTES:
+            return None, None, None, jresponse({'error': 'Payload too large'}, 413)
+        
+        if not request.is_json:
+            return None, None, None, jresponse({'error': 'No JSON data provided'}, 400)
+        
+        # Bodies without a Content-Length are cut off at MAX_CONTENT_LENGTH rather than
+        # rejected; the extra read raises RequestEntityTooLarge if that happened
+        try:
+            body = request.get_data(cache=False)
+            request.stream.read(1)
+        except RequestEntityTooLarge:
+            return None, None, None, jresponse({'error': 'Payload too large'}, 413)
+        if len(body) >= MAX_TTS_PAYLOAD_BYTES:
+            return None, None, None, jresponse({'error': 'Payload too large'}, 413)
+        
+        try:
+            data = orjson.loads(body)
+        except ValueError:
+            data = None
+        
+        if not data or not isinstance(data, dict):
+            return None, None, None, jresponse({'error': 'No JSON data provided'}, 400)
+    
+    # Extract required fields
+    text = data.get('text')
+    language_code = data.get('languageCode', DEFAULT_LANGUAGE_CODE)
+    voice_name = data.get('voiceName', default_voice_name)
+    
+    # Fields are used as cache keys and proto fields, so anything but strings is rejected
+    if text is not None and not isinstance(text, str):
+        return None, None, None, jresponse({'error': 'Text must be a string'}, 400)
+    
+    if not isinstance(language_code, str) or not isinstance(voice_name, str):
+        return None, None, None, jresponse({'error': 'languageCode and voiceName must be strings'}, 400)
+    
+    # Text from UIs is usually trimmed already, so only copy it when needed
+    if text and (text[0].isspace() or text[-1].isspace()):
+        text = text.strip()
+    
+    # Validate input
+    if not text:
+        return None, None, None, jresponse({'error': 'Text is required'}, 400)
+    
+    if len(text) > MAX_TTS_TEXT_LENGTH:
+        return None, None, None, jresponse({'error': f'Text too long (max {MAX_TTS_TEXT_LENGTH} characters)'}, 400)
+    
+    return text, language_code, voice_name, None
+
+def tts_error_response(e):
+    """Map a synthesis exception to a JSON error response"""
+    if isinstance(e, TTSBusyError):
+        return jresponse({
+            'error': 'TTS server is busy. Please try again later.'
+        }, 503)
+    
+    if isinstance(e, FutureTimeoutError):
+        logger.error("TTS Error: timed out waiting for an identical in-flight request")
+        return jresponse({
+            'error': 'TTS request timed out. Please try again.'
+        }, 504)
+    
+    if not isinstance(e, gexc.GoogleAPICallError):
+        logger.error(f"TTS Error: {e}")
+        return jresponse({
+            'error': f'TTS service error: {e}'
+        }, 500)
+    
+    logger.error(f"TTS Error ({e.code}): {e.message}")
+    
+    # Handle specific Google Cloud errors
+    if isinstance(e, gexc.PermissionDenied):
+        return jresponse({
+            'error': 'Permission denied. Please check your Google Cloud credentials and API access.'
+        }, 403)
+    elif isinstance(e, gexc.InvalidArgument):
+        return jresponse({
+            'error': f'Invalid request parameters: {e.message}'
+        }, 400)
+    elif isinstance(e, (gexc.Unimplemented, gexc.ServiceUnavailable)):
+        return jresponse({
+            'error': 'TTS service is currently unavailable. Please try again later.'
+        }, 503)
+    elif isinstance(e, gexc.ResourceExhausted):
+        return jresponse({
+            'error': 'TTS quota exceeded. Please try again later.'
+        }, 429)
+    elif isinstance(e, gexc.DeadlineExceeded):
+        return jresponse({
+            'error': 'TTS request timed out. Please try again.'
+        }, 504)
+    else:
+        return jresponse({
+            'error': f'TTS service error: {e.message}'
+        }, 500)
 
 
 # Or if you want JSON:
 @app.route('/')
 def home():
-    return {"status": "online"}
+    return jresponse({"status": "online"})
 
 @app.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
-    return jsonify({
+    return jresponse({
         'status': 'healthy',
         'service': 'Flask TTS API',
-        'tts_available': client is not None
+        'tts_available': client is not None,
+        'busy_rejections': _busy_rejections
     })
 
-@app.route('/tts', methods=['POST'])
+@app.route('/tts', methods=['GET', 'POST'])
 def text_to_speech():
     """
     Convert text to speech using Google Cloud Text-to-Speech API
@@ -88,199 +584,252 @@ def text_to_speech():
         "languageCode": "en-US",
         "voiceName": "en-US-Wavenet-D"
     }
+    
+    GET takes the same fields as query parameters, so audio elements can
+    point at /tts directly and use conditional and range requests.
     """
     try:
         # Check if TTS client is available
         if client is None:
-            return jsonify({
+            return jresponse({
                 'error': 'Text-to-Speech service is not available. Please check your Google Cloud configuration.'
-            }), 503
+            }, 503)
 
-        # Get JSON data from request
-        data = request.get_json()
-        
-        if not data:
-            return jsonify({'error': 'No JSON data provided'}), 400
-        
-        # Extract required fields
-        text = data.get('text', '').strip()
-        language_code = data.get('languageCode', 'en-US')
-        voice_name = data.get('voiceName', 'en-US-Wavenet-D')
-        
-        # Validate input
-        if not text:
-            return jsonify({'error': 'Text is required'}), 400
-        
-        if len(text) > 5000:
-            return jsonify({'error': 'Text too long (max 5000 characters)'}), 400
+        text, language_code, voice_name, error = parse_tts_request(DEFAULT_VOICE)
+        if error:
+            return error
         
         logger.info(f"TTS request - Language: {language_code}, Voice: {voice_name}, Text length: {len(text)}")
         
-        # Configure the synthesis input
-        synthesis_input = texttospeech.SynthesisInput(text=text)
+        speaking_rate = 1.0
+        pitch = 0.0
+        volume_gain_db = 0.0
+        key = tts_cache_key(text, language_code, voice_name, speaking_rate, pitch, volume_gain_db)
         
-        # Configure the voice
-        voice = texttospeech.VoiceSelectionParams(
-            language_code=language_code,
-            name=voice_name
-        )
+        # The client already holds this audio, so skip synthesis entirely
+        if request.if_none_match.contains_weak(key):
+            response = Response(status=304)
+            response.headers['ETag'] = f'"{key}"'
+            response.headers['Cache-Control'] = f'public, max-age={TTS_CACHE_MAX_AGE}'
+            return response
         
-        # Configure the audio format
-        audio_config = texttospeech.AudioConfig(
-            audio_encoding=texttospeech.AudioEncoding.MP3,
-            speaking_rate=1.0,
-            pitch=0.0,
-            volume_gain_db=0.0
+        audio_content = synthesize_coalesced(
+            key, text, language_code, voice_name, speaking_rate, pitch, volume_gain_db
         )
         
-        # Make the TTS request
-        response = client.synthesize_speech(
-            input=synthesis_input,
-            voice=voice,
-            audio_config=audio_config
-        )
+        logger.info(f"TTS synthesis completed successfully for language: {language_code}")
         
-        # Create a temporary file to store the audio
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.mp3') as tmp_file:
-            tmp_file.write(response.audio_content)
-            tmp_file_path = tmp_file.name
+        # Serve the on-disk copy once it exists (stable Last-Modified), otherwise from memory.
+        # conditional=True handles If-None-Match, If-Modified-Since and Range for GET requests
+        cache_path = _cache_path(key)
+        try:
+            return send_file(
+                cache_path,
+                mimetype='audio/mpeg',
+                as_attachment=False,
+                download_name='speech.mp3',
+                conditional=True,
+                etag=key,
+                max_age=TTS_CACHE_MAX_AGE
+            )
+        except OSError:
+            # Not written yet, or pruned since
+            return send_file(
+                io.BytesIO(audio_content),
+                mimetype='audio/mpeg',
+                as_attachment=False,
+                download_name='speech.mp3',
+                conditional=True,
+                etag=key,
+                max_age=TTS_CACHE_MAX_AGE
+            )
         
-        logger.info(f"TTS synthesis completed successfully for language: {language_code}")
+    except Exception as e:
+        return tts_error_response(e)
+
+@app.route('/tts/stream', methods=['POST'])
+def text_to_speech_stream():
+    """
+    Stream synthesized speech as it is generated using Google Cloud streaming synthesis
+    
+    Expected JSON payload:
+    {
+        "text": "Hello world",
+        "languageCode": "en-US",
+        "voiceName": "en-US-Chirp3-HD-Charon"
+    }
+    """
+    try:
+        # Check if TTS client is available
+        if client is None:
+            return jresponse({
+                'error': 'Text-to-Speech service is not available. Please check your Google Cloud configuration.'
+            }, 503)
+
+        text, language_code, voice_name, error = parse_tts_request(DEFAULT_STREAMING_VOICE)
+        if error:
+            return error
+        
+        logger.info(f"TTS stream request - Language: {language_code}, Voice: {voice_name}, Text length: {len(text)}")
         
-        # Return the audio file
-        return send_file(
-            tmp_file_path,
-            mimetype='audio/mpeg',
-            as_attachment=False,
-            download_name='speech.mp3'
+        # The first request carries the config, the following ones the text
+        config_request = texttospeech.StreamingSynthesizeRequest(
+            streaming_config=texttospeech.StreamingSynthesizeConfig(
+                voice=_voice_params(language_code, voice_name),
+                streaming_audio_config=_STREAMING_AUDIO_CONFIG
+            )
+        )
+        text_request = texttospeech.StreamingSynthesizeRequest(
+            input=texttospeech.StreamingSynthesisInput(text=text)
         )
         
-    except Exception as e:
-        logger.error(f"TTS Error: {str(e)}")
+        # The stream holds a synthesis slot for as long as the response is open
+        acquire_tts_slot()
+        try:
+            responses = _pick_client().streaming_synthesize(
+                iter([config_request, text_request]),
+                timeout=TTS_STREAM_TIMEOUT
+            )
+            
+            # Wait for the first chunk here so RPC errors still map to a proper status code
+            first_chunk = next(responses, None)
+            
+            def generate():
+                if first_chunk is not None:
+                    yield first_chunk.audio_content
+                try:
+                    for chunk in responses:
+                        yield chunk.audio_content
+                except gexc.GoogleAPICallError as e:
+                    # Headers are already sent, so all we can do is log and end the stream
+                    logger.error(f"TTS stream error ({e.code}): {e.message}")
+                    return
+                logger.info(f"TTS stream completed successfully for language: {language_code}")
+            
+            response = Response(stream_with_context(generate()), mimetype='audio/ogg')
+            response.headers['X-Accel-Buffering'] = 'no'
+            # The WSGI server closes the response once it is sent or the client goes away
+            response.call_on_close(_tts_semaphore.release)
+            return response
+        except BaseException:
+            _tts_semaphore.release()
+            raise
         
-        # Handle specific Google Cloud errors
-        if "PERMISSION_DENIED" in str(e):
-            return jsonify({
-                'error': 'Permission denied. Please check your Google Cloud credentials and API access.'
-            }), 403
-        elif "INVALID_ARGUMENT" in str(e):
-            return jsonify({
-                'error': f'Invalid request parameters: {str(e)}'
-            }), 400
-        elif "UNIMPLEMENTED" in str(e):
-            return jsonify({
-                'error': 'TTS service is currently unavailable. Please try again later.'
-            }), 503
-        else:
-            return jsonify({
-                'error': f'TTS service error: {str(e)}'
-            }), 500
+    except Exception as e:
+        return tts_error_response(e)
+
+@functools.lru_cache(maxsize=64)
+def _voices_json(language_code, ttl_bucket):
+    """Fetch and JSON-encode the voice list; ttl_bucket rolls over to expire entries"""
+    voices = client.list_voices(language_code=language_code)
+    
+    voice_list = []
+    for voice in voices.voices:
+        voice_list.append({
+            'name': voice.name,
+            'language_codes': list(voice.language_codes),
+            'ssml_gender': voice.ssml_gender.name,
+            'natural_sample_rate_hertz': voice.natural_sample_rate_hertz
+        })
+    
+    return orjson.dumps({
+        'voices': voice_list,
+        'total_count': len(voice_list)
+    })
 
 @app.route('/voices', methods=['GET'])
 def list_voices():
     """List available voices for TTS"""
     try:
         if client is None:
-            return jsonify({
+            return jresponse({
                 'error': 'Text-to-Speech service is not available'
-            }), 503
+            }, 503)
         
         # Get language code from query parameters
         language_code = request.args.get('language_code', '')
         
-        # List available voices
-        voices = client.list_voices(language_code=language_code)
-        
-        voice_list = []
-        for voice in voices.voices:
-            voice_list.append({
-                'name': voice.name,
-                'language_codes': list(voice.language_codes),
-                'ssml_gender': voice.ssml_gender.name,
-                'natural_sample_rate_hertz': voice.natural_sample_rate_hertz
-            })
-        
-        return jsonify({
-            'voices': voice_list,
-            'total_count': len(voice_list)
-        })
+        # Voices rarely change, so serve the pre-encoded listing for up to VOICES_CACHE_TTL
+        voices_json = _voices_json(language_code, int(time.time() // VOICES_CACHE_TTL))
+        return Response(voices_json, mimetype='application/json')
         
     except Exception as e:
         logger.error(f"Error listing voices: {str(e)}")
-        return jsonify({'error': f'Failed to list voices: {str(e)}'}), 500
+        return jresponse({'error': f'Failed to list voices: {str(e)}'}, 500)
+
+SUPPORTED_LANGUAGES = {
+    'en': 'English',
+    'es': 'Spanish',
+    'fr': 'French',
+    'de': 'German',
+    'it': 'Italian',
+    'pt': 'Portuguese',
+    'ru': 'Russian',
+    'ja': 'Japanese',
+    'ko': 'Korean',
+    'zh': 'Chinese',
+    'ar': 'Arabic',
+    'hi': 'Hindi',
+    'nl': 'Dutch',
+    'sv': 'Swedish',
+    'no': 'Norwegian',
+    'da': 'Danish',
+    'fi': 'Finnish',
+    'pl': 'Polish',
+    'tr': 'Turkish',
+    'uk': 'Ukrainian',
+    'cs': 'Czech',
+    'sk': 'Slovak',
+    'hu': 'Hungarian',
+    'ro': 'Romanian',
+    'bg': 'Bulgarian',
+    'hr': 'Croatian',
+    'sl': 'Slovenian',
+    'et': 'Estonian',
+    'lv': 'Latvian',
+    'lt': 'Lithuanian',
+    'th': 'Thai',
+    'vi': 'Vietnamese',
+    'id': 'Indonesian',
+    'ms': 'Malay',
+    'tl': 'Filipino',
+    'el': 'Greek',
+    'he': 'Hebrew',
+    'bn': 'Bengali',
+    'ta': 'Tamil',
+    'te': 'Telugu',
+    'mr': 'Marathi',
+    'gu': 'Gujarati',
+    'pa': 'Punjabi',
+    'ur': 'Urdu',
+    'sw': 'Swahili',
+    'af': 'Afrikaans',
+    'is': 'Icelandic'
+}
+
+# The language list is static, so encode the response once at import
+_SUPPORTED_LANGUAGES_JSON = orjson.dumps({
+    'languages': SUPPORTED_LANGUAGES,
+    'total_count': len(SUPPORTED_LANGUAGES)
+})
 
 @app.route('/supported-languages', methods=['GET'])
 def supported_languages():
     """Return list of supported languages"""
-    languages = {
-        'en': 'English',
-        'es': 'Spanish',
-        'fr': 'French',
-        'de': 'German',
-        'it': 'Italian',
-        'pt': 'Portuguese',
-        'ru': 'Russian',
-        'ja': 'Japanese',
-        'ko': 'Korean',
-        'zh': 'Chinese',
-        'ar': 'Arabic',
-        'hi': 'Hindi',
-        'nl': 'Dutch',
-        'sv': 'Swedish',
-        'no': 'Norwegian',
-        'da': 'Danish',
-        'fi': 'Finnish',
-        'pl': 'Polish',
-        'tr': 'Turkish',
-        'uk': 'Ukrainian',
-        'cs': 'Czech',
-        'sk': 'Slovak',
-        'hu': 'Hungarian',
-        'ro': 'Romanian',
-        'bg': 'Bulgarian',
-        'hr': 'Croatian',
-        'sl': 'Slovenian',
-        'et': 'Estonian',
-        'lv': 'Latvian',
-        'lt': 'Lithuanian',
-        'th': 'Thai',
-        'vi': 'Vietnamese',
-        'id': 'Indonesian',
-        'ms': 'Malay',
-        'tl': 'Filipino',
-        'el': 'Greek',
-        'he': 'Hebrew',
-        'bn': 'Bengali',
-        'ta': 'Tamil',
-        'te': 'Telugu',
-        'mr': 'Marathi',
-        'gu': 'Gujarati',
-        'pa': 'Punjabi',
-        'ur': 'Urdu',
-        'sw': 'Swahili',
-        'af': 'Afrikaans',
-        'is': 'Icelandic'
-    }
-    
-    return jsonify({
-        'languages': languages,
-        'total_count': len(languages)
-    })
+    return Response(_SUPPORTED_LANGUAGES_JSON, mimetype='application/json')
+
 @app.errorhandler(404)
 def not_found(error):
-    return jsonify({'error': 'Endpoint not found'}), 404
+    return jresponse({'error': 'Endpoint not found'}, 404)
+@app.errorhandler(413)
+def payload_too_large(error):
+    return jresponse({'error': 'Payload too large'}, 413)
 @app.errorhandler(500)
 def internal_error(error):
-    return jsonify({'error': 'Internal server error'}), 500
+    return jresponse({'error': 'Internal server error'}, 500)
 
 if __name__ == '__main__':
-    required_env_vars = [
-        "GOOGLE_CLOUD_PROJECT_ID",
-        "GOOGLE_CLOUD_PRIVATE_KEY",
-        "GOOGLE_CLOUD_CLIENT_EMAIL"
-    ]
-    
-    missing_vars = [var for var in required_env_vars if not os.getenv(var)]
+    missing_vars = [var for var in REQUIRED_ENV_VARS if not os.getenv(var)]
     if missing_vars:
         logger.error(f"Missing required environment variables: {missing_vars}")
         logger.info("Please set the following environment variables:")
@@ -289,10 +838,11 @@ if __name__ == '__main__':
     else:
         logger.info("All required environment variables are set")
     
-    print("Starting Flask TTS API server...")
+    print("Starting Flask TTS API development server (use `gunicorn tts:app` in production)...")
     print("Server will run at: http://localhost:8000")
     print("Available endpoints:")
-    print("  POST /tts - Convert text to speech")
+    print("  POST /tts - Convert text to speech (GET with query parameters also works)")
+    print("  POST /tts/stream - Stream speech as it is synthesized")
     print("  GET  /voices - List available voices")
     print("  GET  /supported-languages - Get supported languages")
     print("  GET  /health - Health check")
@@ -301,7 +851,7 @@ if __name__ == '__main__':
     app.run(
         host='0.0.0.0',
         port=port,
-        debug=True,
+        debug=DEBUG,
         threaded=True
     )
 